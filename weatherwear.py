@@ -1,5 +1,17 @@
+import argparse
+import asyncio
+import atexit
+import bisect
+import functools
+import json
+import os
+import time
+
+import httpx
+import orjson
 import requests
-import matplotlib.pyplot as plt
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 # API endpoints (Open-Meteo)
@@ -8,6 +20,91 @@ GEOCODING_URL = "https://geocoding-api.open-meteo.com/v1/search"
 FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
 
 
+# Shared HTTP session so all API calls reuse one TCP/TLS connection
+# instead of re-handshaking with Open-Meteo on every request. Transient
+# server errors on these idempotent GETs are retried with backoff on
+# the warm connection rather than aborting the whole run.
+# Timeouts are split (connect, read) so connect failures fail fast.
+
+_TIMEOUT = (3.05, 10)
+
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(["GET"]),
+        ),
+    ),
+)
+# Advertise brotli alongside gzip; Open-Meteo's JSON compresses to
+# roughly half the gzip size with br.
+_SESSION.headers.update({"Accept-Encoding": "br, gzip"})
+atexit.register(_SESSION.close)
+
+
+# Shared async client for the forecast calls, with the same resilience
+# as the sync session: the transport retries failed connects, and
+# _get_with_retries below backs off on transient server errors.
+
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+_ASYNC_CLIENT = httpx.AsyncClient(
+    transport=httpx.AsyncHTTPTransport(http2=True, retries=3),
+    timeout=httpx.Timeout(10, connect=3.05),
+    headers={"Accept-Encoding": "br, gzip"},
+)
+
+
+async def _get_with_retries(client: httpx.AsyncClient, url: str, params: dict) -> httpx.Response:
+    """
+    GET with up to 3 extra attempts and exponential backoff when the
+    server answers with a transient 429/5xx status, mirroring the
+    Retry policy mounted on the sync session.
+    """
+    for attempt in range(3):
+        resp = await client.get(url, params=params)
+        if resp.status_code not in _RETRY_STATUSES:
+            return resp
+        await asyncio.sleep(0.5 * (2 ** attempt))
+    return await client.get(url, params=params)
+
+
+# Geocoding results are effectively static, so they are cached in memory
+# (LRU) and on disk to skip the network round-trip for repeat cities.
+# Disk entries expire after WEATHERWEAR_GEO_CACHE_TTL seconds (30 days
+# by default).
+
+_GEO_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "weatherwear", "geo.json")
+_GEO_CACHE_TTL = float(os.environ.get("WEATHERWEAR_GEO_CACHE_TTL", 30 * 24 * 3600))
+
+
+def _load_geo_cache() -> dict:
+    try:
+        with open(_GEO_CACHE_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_geo_cache():
+    try:
+        os.makedirs(os.path.dirname(_GEO_CACHE_PATH), exist_ok=True)
+        with open(_GEO_CACHE_PATH, "w", encoding="utf-8") as f:
+            json.dump(_GEO_CACHE, f)
+    except OSError:
+        pass
+
+
+_GEO_CACHE = _load_geo_cache()
+atexit.register(_save_geo_cache)
+
+
 # Geocoding: city -> lat/lon
 
 def geocode_city(city_name: str) -> dict:
@@ -15,18 +112,13 @@ def geocode_city(city_name: str) -> dict:
     Use Open-Meteo's free Geocoding API to convert a city name
     into latitude, longitude and some metadata.
     """
-    params = {
-        "name": city_name,
-        "count": 1,
-        "language": "en",
-        "format": "json",
-    }
-    resp = requests.get(GEOCODING_URL, params=params, timeout=10)
+    return dict(_geocode_city_cached(city_name.strip().lower()))
 
-    if resp.status_code != 200:
-        raise ValueError(f"Geocoding error: {resp.status_code} - {resp.text}")
 
-    data = resp.json()
+_GEOCODING_PARAMS = {"count": 1, "language": "en", "format": "json"}
+
+
+def _parse_geocode_payload(data: dict, city_name: str) -> dict:
     results = data.get("results")
     if not results:
         raise ValueError(f"No location found for '{city_name}'")
@@ -41,80 +133,120 @@ def geocode_city(city_name: str) -> dict:
     }
 
 
+@functools.lru_cache(maxsize=256)
+def _geocode_city_cached(city_name: str) -> dict:
+    cached = _GEO_CACHE.get(city_name)
+    if cached and time.time() - cached.get("fetched_at", 0) < _GEO_CACHE_TTL:
+        return cached["result"]
+
+    params = {"name": city_name, **_GEOCODING_PARAMS}
+    resp = _SESSION.get(GEOCODING_URL, params=params, timeout=_TIMEOUT)
 
-def fetch_current_weather(lat: float, lon: float, units: str = "metric") -> dict:
+    if resp.status_code != 200:
+        raise ValueError(f"Geocoding error: {resp.status_code} - {resp.text}")
+
+    result = _parse_geocode_payload(orjson.loads(resp.content), city_name)
+    _GEO_CACHE[city_name] = {"fetched_at": time.time(), "result": result}
+    return result
+
+
+async def geocode_city_async(city_name: str, client: httpx.AsyncClient) -> dict:
     """
-    Call Open-Meteo Forecast API and retrieve current weather variables.
-    No API key is required.
+    Async variant of geocode_city for batch mode, sharing the same
+    disk cache.
     """
-    # Map our units choice to Open-Meteo parameter values
-    temperature_unit = "celsius" if units == "metric" else "fahrenheit"
-    windspeed_unit = "kmh" if units == "metric" else "mph"
+    city_name = city_name.strip().lower()
+    cached = _GEO_CACHE.get(city_name)
+    if cached and time.time() - cached.get("fetched_at", 0) < _GEO_CACHE_TTL:
+        return dict(cached["result"])
+
+    params = {"name": city_name, **_GEOCODING_PARAMS}
+    resp = await _get_with_retries(client, GEOCODING_URL, params)
+
+    if resp.status_code != 200:
+        raise ValueError(f"Geocoding error: {resp.status_code} - {resp.text}")
+
+    result = _parse_geocode_payload(orjson.loads(resp.content), city_name)
+    _GEO_CACHE[city_name] = {"fetched_at": time.time(), "result": result}
+    return dict(result)
+
 
+
+# Forecast request pieces that never change between calls, hoisted so
+# batch mode doesn't rebuild the variable strings and unit mapping on
+# every request. The unit dicts map our units choice to Open-Meteo
+# parameter values.
+
+_CURRENT_VARS = "temperature_2m,relative_humidity_2m,apparent_temperature,precipitation,weather_code,wind_speed_10m"
+_DAILY_VARS = "temperature_2m_max,temperature_2m_min"
+_UNIT_PARAMS = {
+    "metric": {"temperature_unit": "celsius", "windspeed_unit": "kmh"},
+    "imperial": {"temperature_unit": "fahrenheit", "windspeed_unit": "mph"},
+}
+
+
+async def fetch_weather_bundle(lat: float, lon: float, units: str = "metric",
+                               client: httpx.AsyncClient = None):
+    """
+    Call Open-Meteo Forecast API once for both the current weather
+    variables and the 5-day daily forecast. No API key is required.
+    """
     params = {
         "latitude": lat,
         "longitude": lon,
-        "current": "temperature_2m,relative_humidity_2m,apparent_temperature,precipitation,weather_code,wind_speed_10m",
+        "current": _CURRENT_VARS,
+        "daily": _DAILY_VARS,
+        "forecast_days": 5,
         "timezone": "auto",
-        "temperature_unit": temperature_unit,
-        "windspeed_unit": windspeed_unit,
+        **_UNIT_PARAMS[units],
     }
 
-    resp = requests.get(FORECAST_URL, params=params, timeout=10)
+    resp = await _get_with_retries(client or _ASYNC_CLIENT, FORECAST_URL, params)
     if resp.status_code != 200:
         raise ValueError(f"Weather API error: {resp.status_code} - {resp.text}")
 
-    data = resp.json()
+    data = orjson.loads(resp.content)
     current = data.get("current", {})
     if not current:
         raise ValueError("No current weather data returned.")
 
-    return current
+    return current, data.get("daily", {})
 
 
 
+# Based on WMO weather code groups (simplified), expanded into a flat
+# lookup table so describe_weather_code is a single dict access.
+
+_CODE_TO_DESC = {
+    0: "clear sky",
+    **dict.fromkeys([1, 2, 3], "partly cloudy or overcast"),
+    **dict.fromkeys([45, 48], "foggy or misty"),
+    **dict.fromkeys([51, 53, 55, 56, 57], "drizzle or light rain"),
+    **dict.fromkeys([61, 63, 65, 66, 67, 80, 81, 82], "rainy"),
+    **dict.fromkeys([71, 73, 75, 77, 85, 86], "snowy"),
+    **dict.fromkeys([95, 96, 99], "thunderstorms"),
+}
+
+
 def describe_weather_code(code: int) -> str:
     """
     Map Open-Meteo WMO weather codes to a simple text description.
     """
     if code is None:
         return "unknown weather"
+    return _CODE_TO_DESC.get(code, "mixed or unknown conditions")
 
-    # Based on WMO weather code groups (simplified)
-    if code == 0:
-        return "clear sky"
-    if code in [1, 2, 3]:
-        return "partly cloudy or overcast"
-    if code in [45, 48]:
-        return "foggy or misty"
-    if code in [51, 53, 55, 56, 57]:
-        return "drizzle or light rain"
-    if code in [61, 63, 65, 66, 67, 80, 81, 82]:
-        return "rainy"
-    if code in [71, 73, 75, 77, 85, 86]:
-        return "snowy"
-    if code in [95, 96, 99]:
-        return "thunderstorms"
-    return "mixed or unknown conditions"
-
-def fetch_forecast_5day(lat: float, lon: float, units: str = "metric"):
+@functools.lru_cache(maxsize=1)
+def _chart_modules():
     """
-    Fetch the next 5 days of forecast data from Open-Meteo
-    for plotting temperature trends.
+    Import Matplotlib and numpy on first use only, so runs that never
+    reach the charting step (or fail earlier) don't pay the several
+    hundred milliseconds of import cost at startup.
     """
-    temperature_unit = "celsius" if units == "metric" else "fahrenheit"
-    params = {
-        "latitude": lat,
-        "longitude": lon,
-        "daily": "temperature_2m_max,temperature_2m_min",
-        "timezone": "auto",
-        "temperature_unit": temperature_unit,
-    }
-
-    resp = requests.get(FORECAST_URL, params=params, timeout=10)
-    resp.raise_for_status()
-    data = resp.json()
-    return data.get("daily", {})
+    import numpy as np
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    return np, Figure, FigureCanvasAgg
 
 
 def create_temperature_chart(forecast_data, units: str = "metric"):
@@ -130,24 +262,39 @@ def create_temperature_chart(forecast_data, units: str = "metric"):
         print("Not enough forecast data to generate chart.")
         return
 
-    plt.figure(figsize=(8, 5))
-    plt.plot(dates, max_temps, marker="o", label="Max Temp")
-    plt.plot(dates, min_temps, marker="o", label="Min Temp")
+    # Use the object-oriented API on the Agg backend directly, so no GUI
+    # backend is detected or loaded, and hand Matplotlib numpy arrays so
+    # the line renderer takes its C fast path.
+    np, Figure, FigureCanvasAgg = _chart_modules()
+
+    max_temps = np.asarray(max_temps, dtype=np.float32)
+    min_temps = np.asarray(min_temps, dtype=np.float32)
+
+    fig = Figure(figsize=(8, 5))
+    ax = fig.subplots()
+    ax.plot(dates, max_temps, marker="o", label="Max Temp")
+    ax.plot(dates, min_temps, marker="o", label="Min Temp")
 
     unit_symbol = "°C" if units == "metric" else "°F"
-    plt.title(f"5-Day Temperature Forecast")
-    plt.xlabel("Date")
-    plt.ylabel(f"Temperature ({unit_symbol})")
-    plt.grid(True)
-    plt.legend()
+    ax.set_title("5-Day Temperature Forecast")
+    ax.set_xlabel("Date")
+    ax.set_ylabel(f"Temperature ({unit_symbol})")
+    ax.grid(True)
+    ax.legend()
 
-    plt.tight_layout()
-    plt.savefig("temperature_chart.png")
-    plt.close()
+    fig.tight_layout()
+    FigureCanvasAgg(fig).print_png("temperature_chart.png")
 
     print("Temperature chart saved as temperature_chart.png")
 
 
+# Temperature bands: break i marks the lower bound of label i+1, so a
+# single bisect finds the band instead of a cascade of range checks.
+
+_TEMP_BREAKS = (-5, 5, 15, 22, 28)
+_TEMP_LABELS = ("very cold", "cold", "cool", "mild", "warm", "hot")
+
+
 def analyze_weather(current: dict, units: str = "metric") -> dict:
     """
     Take the 'current' block from Open-Meteo and convert it into
@@ -166,18 +313,8 @@ def analyze_weather(current: dict, units: str = "metric") -> dict:
     t = temp
     if t is None:
         temp_label = "unknown"
-    elif t < -5:
-        temp_label = "very cold"
-    elif -5 <= t < 5:
-        temp_label = "cold"
-    elif 5 <= t < 15:
-        temp_label = "cool"
-    elif 15 <= t < 22:
-        temp_label = "mild"
-    elif 22 <= t < 28:
-        temp_label = "warm"
     else:
-        temp_label = "hot"
+        temp_label = _TEMP_LABELS[bisect.bisect_right(_TEMP_BREAKS, t)]
 
     # Flags
     if units == "metric":
@@ -207,45 +344,59 @@ def analyze_weather(current: dict, units: str = "metric") -> dict:
     }
 
 
+# Clothing lookups for recommend_clothing: one dict access for the base
+# layer and one pass over a tuple for the weather flags, in place of a
+# chain of string comparisons.
+
+_BASE_LAYER = {
+    "very cold": "a heavy winter coat, thermal layers, gloves, and a warm hat",
+    "cold": "a warm jacket, sweater, and long pants",
+    "cool": "a light jacket or hoodie with long pants",
+    "mild": "a long-sleeve shirt or light sweater with jeans or chinos",
+    "warm": "a t-shirt or light top with breathable pants or shorts",
+    "hot": "a very light t-shirt and shorts or other breathable clothing",
+}
+
+# Messages for the (is_rainy, is_snowy, is_windy) flags, in output order.
+_FLAG_RECS = (
+    "carry a waterproof jacket or umbrella",
+    "wear waterproof boots and an insulated jacket",
+    "add a windbreaker or an extra layer to block the wind",
+)
+
+
 def recommend_clothing(analysis: dict, context: str) -> str:
     """
     Given analyzed weather and context ('indoor' or 'outdoor'),
     return a human-readable clothing recommendation.
     """
-    temp_label = analysis["temp_label"]
-    is_windy = analysis["is_windy"]
-    is_humid = analysis["is_humid"]
-    is_rainy = analysis["is_rainy"]
-    is_snowy = analysis["is_snowy"]
+    return _recommend_cached(
+        analysis["temp_label"],
+        analysis["is_windy"],
+        analysis["is_humid"],
+        analysis["is_rainy"],
+        analysis["is_snowy"],
+        context,
+    )
 
-    recs = []
 
+@functools.lru_cache(maxsize=1024)
+def _recommend_cached(
+    temp_label: str,
+    is_windy: bool,
+    is_humid: bool,
+    is_rainy: bool,
+    is_snowy: bool,
+    context: str,
+) -> str:
     # Base layer based on temperature
-    if temp_label == "very cold":
-        recs.append("a heavy winter coat, thermal layers, gloves, and a warm hat")
-    elif temp_label == "cold":
-        recs.append("a warm jacket, sweater, and long pants")
-    elif temp_label == "cool":
-        recs.append("a light jacket or hoodie with long pants")
-    elif temp_label == "mild":
-        recs.append("a long-sleeve shirt or light sweater with jeans or chinos")
-    elif temp_label == "warm":
-        recs.append("a t-shirt or light top with breathable pants or shorts")
-    elif temp_label == "hot":
-        recs.append("a very light t-shirt and shorts or other breathable clothing")
-    else:
-        recs.append("comfortable layered clothing, as temperature is unclear")
-
-    # Precipitation
-    if is_rainy:
-        recs.append("carry a waterproof jacket or umbrella")
-    if is_snowy:
-        recs.append("wear waterproof boots and an insulated jacket")
-
-    # Wind & humidity adjustments
-    if is_windy:
-        recs.append("add a windbreaker or an extra layer to block the wind")
-    if is_humid and temp_label in ["warm", "hot"]:
+    recs = [_BASE_LAYER.get(temp_label, "comfortable layered clothing, as temperature is unclear")]
+
+    # Precipitation and wind adjustments
+    recs += [msg for flagged, msg in zip((is_rainy, is_snowy, is_windy), _FLAG_RECS) if flagged]
+
+    # Humidity only matters when it is also warm out
+    if is_humid and temp_label in ("warm", "hot"):
         recs.append("choose moisture-wicking fabrics to stay comfortable in the humidity")
 
     # Indoor vs outdoor context
@@ -266,6 +417,15 @@ def recommend_clothing(analysis: dict, context: str) -> str:
 
 
 
+def _fmt_reading(value, spec: str = "", suffix: str = "") -> str:
+    """
+    Format one reading with its unit, or 'N/A' when it is missing.
+    """
+    if value is None:
+        return "N/A"
+    return f"{value:{spec}}{suffix}"
+
+
 def format_weather_summary(location_info: dict, analysis: dict) -> str:
     """
     Create a readable weather summary string from location + analysis.
@@ -281,36 +441,107 @@ def format_weather_summary(location_info: dict, analysis: dict) -> str:
     temp_label = analysis["temp_label"]
 
     unit_symbol = "°C" if units == "metric" else "°F"
+    wind_unit = "km/h" if units == "metric" else "mph"
 
     lines = [
         f"Weather summary for {name}, {country}:",
         f"  Condition     : {description} ({temp_label})",
-        f"  Temperature   : {temp:.1f}{unit_symbol}" if temp is not None else "  Temperature   : N/A",
-        f"  Feels like    : {feels_like:.1f}{unit_symbol}" if feels_like is not None else "  Feels like    : N/A",
-        f"  Humidity      : {humidity}% " if humidity is not None else "  Humidity      : N/A",
-        f"  Wind speed    : {wind_speed} " + ("km/h" if units == "metric" else "mph")
-        if wind_speed is not None else "  Wind speed    : N/A",
+        f"  Temperature   : {_fmt_reading(temp, '.1f', unit_symbol)}",
+        f"  Feels like    : {_fmt_reading(feels_like, '.1f', unit_symbol)}",
+        f"  Humidity      : {_fmt_reading(humidity, '', '% ')}",
+        f"  Wind speed    : {_fmt_reading(wind_speed, '', ' ' + wind_unit)}",
     ]
     return "\n".join(lines)
 
 
+# Batch mode: fan out geocoding + weather for many cities concurrently
+# on one shared client instead of looping serially.
+
+
+async def process_city(city: str, context: str, units: str, client: httpx.AsyncClient) -> str:
+    """
+    Geocode one city, fetch its weather and build the full summary +
+    recommendation text.
+    """
+    location_info = await geocode_city_async(city, client)
+    current, _ = await fetch_weather_bundle(
+        location_info["latitude"],
+        location_info["longitude"],
+        units=units,
+        client=client,
+    )
+    analysis = analyze_weather(current, units=units)
+    recommendation = recommend_clothing(analysis, context=context)
+    return (
+        f"{format_weather_summary(location_info, analysis)}\n"
+        f"\nClothing Recommendation:\n{recommendation}"
+    )
+
+
+async def _process_many(cities, context: str, units: str):
+    # Cap connections so a long city list doesn't hammer Open-Meteo;
+    # HTTP/2 multiplexes the requests over one TCP connection anyway.
+    async with httpx.AsyncClient(
+        transport=httpx.AsyncHTTPTransport(
+            http2=True,
+            retries=3,
+            limits=httpx.Limits(max_connections=10),
+        ),
+        timeout=httpx.Timeout(10, connect=3.05),
+        headers={"Accept-Encoding": "br, gzip"},
+    ) as client:
+        return await asyncio.gather(
+            *(process_city(city, context, units, client) for city in cities),
+            return_exceptions=True,
+        )
+
+
 # Main program
 
 
+def _parse_args():
+    parser = argparse.ArgumentParser(
+        description="Get a weather summary and clothing recommendation for a city."
+    )
+    parser.add_argument("--city", help="city name; skips the interactive prompt")
+    parser.add_argument("--cities", help="comma-separated city names to process concurrently")
+    parser.add_argument("--context", choices=["indoor", "outdoor"], help="where you are headed")
+    parser.add_argument("--units", choices=["metric", "imperial"], help="unit system")
+    return parser.parse_args()
+
+
 def main():
+    args = _parse_args()
+
     print("=== WeatherWear (Open-Meteo Edition) ===\n")
 
-    city = input("Enter your city name (e.g., Buffalo, London, Dhaka): ").strip()
+    if args.cities:
+        cities = [c.strip() for c in args.cities.split(",") if c.strip()]
+        results = asyncio.run(
+            _process_many(cities, args.context or "outdoor", args.units or "metric")
+        )
+        for city, result in zip(cities, results):
+            if isinstance(result, Exception):
+                print(f"Failed to process '{city}': {result}")
+            else:
+                print(result)
+            print()
+        print("Thank you for using WeatherWear!")
+        return
+
+    # Only fall back to input() for whatever was not passed on the
+    # command line, so scripted runs never block on a prompt.
+    city = args.city or input("Enter your city name (e.g., Buffalo, London, Dhaka): ").strip()
     if not city:
         print("City name is required. Exiting.")
         return
 
-    context = input("Are you going indoor or outdoor? (type 'indoor' or 'outdoor'): ").strip().lower()
+    context = args.context or input("Are you going indoor or outdoor? (type 'indoor' or 'outdoor'): ").strip().lower()
     if context not in ["indoor", "outdoor"]:
         print("Context not recognized. Defaulting to 'outdoor'.")
         context = "outdoor"
 
-    unit_choice = input("Use metric (Celsius) or imperial (Fahrenheit)? [metric/imperial, default=metric]: ").strip().lower()
+    unit_choice = args.units or input("Use metric (Celsius) or imperial (Fahrenheit)? [metric/imperial, default=metric]: ").strip().lower()
     if unit_choice not in ["metric", "imperial"]:
         unit_choice = "metric"
 
@@ -325,10 +556,16 @@ def main():
         f"Found: {location_info.get('name')}, {location_info.get('country')} "
         f"(lat={location_info.get('latitude')}, lon={location_info.get('longitude')})"
     )
-    print("Fetching current weather...\n")
+    print("Fetching current weather and 5-day forecast...\n")
 
     try:
-        current = fetch_current_weather(location_info["latitude"], location_info["longitude"], units=unit_choice)
+        current, forecast_data = asyncio.run(
+            fetch_weather_bundle(
+                location_info["latitude"],
+                location_info["longitude"],
+                units=unit_choice,
+            )
+        )
     except Exception as e:
         print(f"Failed to fetch weather data: {e}")
         return
@@ -343,11 +580,6 @@ def main():
 
     print("\nGenerating 5-day temperature chart for your presentation...")
     try:
-        forecast_data = fetch_forecast_5day(
-            location_info["latitude"],
-            location_info["longitude"],
-            units=unit_choice
-        )
         create_temperature_chart(forecast_data, units=unit_choice)
     except Exception as e:
         print(f"Could not generate temperature chart: {e}")